@@ -1,14 +1,12 @@
 #!/usr/bin/env python3
-import os
 import math
-from datetime import datetime
-import time
+import queue
+import subprocess
+import threading
 import numpy as np
 from common.params import Params
-from common.numpy_fast import interp
 
 import cereal.messaging as messaging
-from cereal import car
 from common.realtime import sec_since_boot
 from selfdrive.swaglog import cloudlog
 from selfdrive.config import Conversions as CV
@@ -21,54 +19,96 @@ from selfdrive.controls.lib.long_mpc_model import LongitudinalMpcModel
 
 LON_MPC_STEP = 0.2  # first step is 0.2s
 AWARENESS_DECEL = -0.2     # car smoothly decel at .2m/s^2 when user is distracted
+LON_PLAN_SOURCES = ('cruise', 'mpc1', 'mpc2', 'model')
+PARAMS_REFRESH_TIME = 1.0  # toggles only change at human timescales, no need to read them every step
 
 # lookup tables VS speed to determine min and max accels in cruise
 # make sure these accelerations are smaller than mpc limits
 #_A_CRUISE_MIN_V_FOLLOWING = [-3.5, -3.5, -3.5, -2.5, -1.5]
-_A_CRUISE_MIN_V_FOLLOWING = [-2.7, -2.4, -2.0, -1.4, -0.5]
-_A_CRUISE_MIN_V = [-1.0, -.8, -.67, -.5, -.30]
-_A_CRUISE_MIN_BP = [  0.,  5.,  10., 20.,  40.]
+_A_CRUISE_MIN_V_FOLLOWING = np.array([-2.7, -2.4, -2.0, -1.4, -0.5])
+_A_CRUISE_MIN_V = np.array([-1.0, -.8, -.67, -.5, -.30])
+_A_CRUISE_MIN_BP = np.array([  0.,  5.,  10., 20.,  40.])
 
 # need fast accel at very low speed for stop and go
 # make sure these accelerations are smaller than mpc limits
-_A_CRUISE_MAX_V = [1.2, 1.2, 0.65, .4]
-_A_CRUISE_MAX_V_FOLLOWING = [1.6, 1.6, 0.65, .4]
-_A_CRUISE_MAX_BP = [0., 6.4, 22.5, 40.]
+_A_CRUISE_MAX_V = np.array([1.2, 1.2, 0.65, .4])
+_A_CRUISE_MAX_V_FOLLOWING = np.array([1.6, 1.6, 0.65, .4])
+_A_CRUISE_MAX_BP = np.array([0., 6.4, 22.5, 40.])
 
 # Lookup table for turns
-_A_TOTAL_MAX_V = [1.7, 3.2]
-_A_TOTAL_MAX_BP = [20., 40.]
+_A_TOTAL_MAX_V = np.array([1.7, 3.2])
+_A_TOTAL_MAX_BP = np.array([20., 40.])
 
+# Lookup tables for the speed camera alert distance
+_CAM_DIST_V = np.array([3.75, 5.5, 6., 7.])
+_CAM_DIST_BP = np.array([30., 60., 100., 160.])  # kph
+_CONSIDER_SPEED_V = np.array([1., 1.3])
+_CONSIDER_SPEED_BP = np.array([10., 30.])  # kph over the camera speed limit
 
-def calc_cruise_accel_limits(v_ego, following):
+
+def calc_accel_limits(v_ego, angle_steers, following, CP):
+  """
+  This function returns the cruise accel limits and the long acceleration allowed, depending on the
+  existing lateral acceleration. This should avoid accelerating when losing the target in turns
+  """
   if following:
-    a_cruise_min = interp(v_ego, _A_CRUISE_MIN_BP, _A_CRUISE_MIN_V_FOLLOWING)
-    a_cruise_max = interp(v_ego, _A_CRUISE_MAX_BP, _A_CRUISE_MAX_V_FOLLOWING)
+    a_cruise_min = np.interp(v_ego, _A_CRUISE_MIN_BP, _A_CRUISE_MIN_V_FOLLOWING)
+    a_cruise_max = np.interp(v_ego, _A_CRUISE_MAX_BP, _A_CRUISE_MAX_V_FOLLOWING)
   else:
-    a_cruise_min = interp(v_ego, _A_CRUISE_MIN_BP, _A_CRUISE_MIN_V)
-    a_cruise_max = interp(v_ego, _A_CRUISE_MAX_BP, _A_CRUISE_MAX_V)
-      
-  return np.vstack([a_cruise_min, a_cruise_max])
+    a_cruise_min = np.interp(v_ego, _A_CRUISE_MIN_BP, _A_CRUISE_MIN_V)
+    a_cruise_max = np.interp(v_ego, _A_CRUISE_MAX_BP, _A_CRUISE_MAX_V)
+
+  a_total_max = np.interp(v_ego, _A_TOTAL_MAX_BP, _A_TOTAL_MAX_V)
+  a_y = v_ego * v_ego * angle_steers * CV.DEG_TO_RAD / (CP.steerRatio * CP.wheelbase)
+  a_x_allowed_sq = a_total_max * a_total_max - a_y * a_y
+  a_x_allowed = math.sqrt(a_x_allowed_sq) if a_x_allowed_sq > 0. else 0.
 
+  return a_cruise_min, a_cruise_max, min(a_cruise_max, a_x_allowed)
 
-def limit_accel_in_turns(v_ego, angle_steers, a_target, CP):
+
+def calc_cam_distance_threshold(v_ego_kph, target_speed):
   """
-  This function returns a limited long acceleration allowed, depending on the existing lateral acceleration
-  this should avoid accelerating when losing the target in turns
+  This function returns the distance to a speed camera under which its limit is shown,
+  increasing with speed and with how far over the limit we are driving
   """
+  cam_distance_calc = np.interp(v_ego_kph, _CAM_DIST_BP, _CAM_DIST_V)
+  consider_speed = np.interp(v_ego_kph - target_speed, _CONSIDER_SPEED_BP, _CONSIDER_SPEED_V)
+  return cam_distance_calc * consider_speed * v_ego_kph
 
-  a_total_max = interp(v_ego, _A_TOTAL_MAX_BP, _A_TOTAL_MAX_V)
-  a_y = v_ego**2 * angle_steers * CV.DEG_TO_RAD / (CP.steerRatio * CP.wheelbase)
-  a_x_allowed = math.sqrt(max(a_total_max**2 - a_y**2, 0.))
 
-  return [a_target[0], min(a_target[1], a_x_allowed)]
+def map_speed_logcat_thread(requests):
+  """
+  Stores the latest speed camera limit and distance logged by the map app into params.
+  Requests are (read, clear) pairs handled one at a time, so a logcat clear can never
+  land between a read and its param write, and the planner loop never waits on logcat
+  """
+  params = Params()
+  while True:
+    read, clear = requests.get()
+
+    if read:
+      for key, tags in (("LimitSetSpeedCamera", "opkrspdlimit,opkrspd2limit"), ("LimitSetSpeedCameraDist", "opkrspddist")):
+        try:
+          out = subprocess.run(["logcat", "-d", "-s", tags], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               universal_newlines=True, timeout=1.0).stdout
+        except (OSError, subprocess.SubprocessError):
+          continue
+        lines = [line for line in out.splitlines() if "opkrspd" in line]
+        fields = lines[-1].split() if lines else []
+        params.put(key, fields[6] if len(fields) > 6 else "")
+
+    if clear:
+      try:
+        subprocess.run(["logcat", "-c"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=1.0)
+      except (OSError, subprocess.SubprocessError):
+        pass
 
 
 class ModelMpcHelper:
   def __init__(self):
-    self.model_t = [i ** 2 / 102.4 for i in range(33)]  # the timesteps of the model predictions
-    self.mpc_t = list(range(10))  # the timesteps of what the LongMpcModel class takes in, 1 sec intervels to 10
-    self.model_t_idx = [sorted(range(len(self.model_t)), key=[abs(idx - t) for t in self.model_t].__getitem__)[0] for idx in self.mpc_t]  # matches 0 to 9 interval to idx from t
+    self.model_t = np.arange(33, dtype=np.float64) ** 2 / 102.4  # the timesteps of the model predictions
+    self.mpc_t = np.arange(10, dtype=np.float64)  # the timesteps of what the LongMpcModel class takes in, 1 sec intervels to 10
+    self.model_t_idx = np.abs(self.model_t[:, None] - self.mpc_t[None, :]).argmin(axis=0)  # matches 0 to 9 interval to idx from t
     assert len(self.model_t_idx) == 10, 'Needs to be length 10 for mpc'
 
   def convert_data(self, sm):
@@ -77,15 +117,14 @@ class ModelMpcHelper:
     if not sm.alive['modelV2'] or len(modelV2.position.x) == 0:
       return distances, speeds, accelerations
 
-    speeds = [modelV2.velocity.x[t] for t in self.model_t_idx]
-    distances = [modelV2.position.x[t] for t in self.model_t_idx]
-    for t in self.mpc_t:  # todo these three in one loop
-      if 0 < t < 9:
-        accelerations.append((speeds[t + 1] - speeds[t - 1]) / 2)
+    speeds = np.array(modelV2.velocity.x)[self.model_t_idx]
+    distances = np.array(modelV2.position.x)[self.model_t_idx]
 
-    # Extrapolate forward and backward at edges
-    accelerations.append(accelerations[-1] - (accelerations[-2] - accelerations[-1]))
-    accelerations.insert(0, accelerations[0] - (accelerations[1] - accelerations[0]))
+    # Central differences, then extrapolate forward and backward at edges
+    accelerations = np.empty(len(self.mpc_t))
+    accelerations[1:-1] = (speeds[2:] - speeds[:-2]) / 2
+    accelerations[0] = 2 * accelerations[1] - accelerations[2]
+    accelerations[-1] = 2 * accelerations[-2] - accelerations[-3]
     return distances, speeds, accelerations
 
 
@@ -111,11 +150,15 @@ class Planner():
 
     self.longitudinalPlanSource = 'cruise'
     self.fcw_checker = FCWChecker()
-    self.path_x = np.arange(192)
 
     self.fcw = False
+    # longitudinalPlan only has scalar fields and all of them are rewritten on every publish,
+    # so one builder can be reused instead of allocating a new message each step
+    self.plan_send = messaging.new_message('longitudinalPlan')
 
     self.params = Params()
+    self.param_cache = {"OpkrMapEnable": False, "ModelLongEnabled": False}
+    self.param_next_refresh = 0.0
     self.first_loop = True
 
     self.target_speed_map = 0.0
@@ -127,58 +170,62 @@ class Planner():
     self.target_speed_map_dist = 0
     self.target_speed_map_block = False
     self.target_speed_map_sign = False
-    self.tartget_speed_offset = int(self.params.get("OpkrSpeedLimitOffset", encoding="utf8"))
+    self.map_speed_requests = queue.Queue()
+    threading.Thread(target=map_speed_logcat_thread, args=(self.map_speed_requests,), daemon=True).start()
     self.vego = 0
 
+  def cached_bool(self, key, cur_time):
+    if cur_time >= self.param_next_refresh:
+      self.param_next_refresh = cur_time + PARAMS_REFRESH_TIME
+      for k in self.param_cache:
+        self.param_cache[k] = self.params.get_bool(k)
+    return self.param_cache[key]
+
   def choose_solution(self, v_cruise_setpoint, enabled, model_enabled):
-    possible_futures = [self.mpc1.v_mpc_future, self.mpc2.v_mpc_future, v_cruise_setpoint]
+    # builtin min keeps the old ordering semantics if an mpc future is NaN
+    v_acc_future = min(self.mpc1.v_mpc_future, self.mpc2.v_mpc_future, v_cruise_setpoint)
     if enabled:
-      solutions = {'cruise': self.v_cruise}
-      if self.mpc1.prev_lead_status:
-        solutions['mpc1'] = self.mpc1.v_mpc
-      if self.mpc2.prev_lead_status:
-        solutions['mpc2'] = self.mpc2.v_mpc
-      if self.mpc_model.valid and model_enabled:
-        solutions['model'] = self.mpc_model.v_mpc
-        possible_futures.append(self.mpc_model.v_mpc_future)  # only used when using model
-
-      slowest = min(solutions, key=solutions.get)
-
-      self.longitudinalPlanSource = slowest
+      use_model = self.mpc_model.valid and model_enabled
+      if use_model:
+        v_acc_future = min(v_acc_future, self.mpc_model.v_mpc_future)  # only used when using model
+
+      # inactive sources get +inf, ties resolve in LON_PLAN_SOURCES order
+      slowest = min((self.v_cruise, 0),
+                    (self.mpc1.v_mpc if self.mpc1.prev_lead_status else math.inf, 1),
+                    (self.mpc2.v_mpc if self.mpc2.prev_lead_status else math.inf, 2),
+                    (self.mpc_model.v_mpc if use_model else math.inf, 3))[1]
+
+      self.longitudinalPlanSource = LON_PLAN_SOURCES[slowest]
       # Choose lowest of MPC and cruise
-      if slowest == 'mpc1':
-        self.v_acc = self.mpc1.v_mpc
-        self.a_acc = self.mpc1.a_mpc
-      elif slowest == 'mpc2':
-        self.v_acc = self.mpc2.v_mpc
-        self.a_acc = self.mpc2.a_mpc
-      elif slowest == 'cruise':
-        self.v_acc = self.v_cruise
-        self.a_acc = self.a_cruise
-      elif slowest == 'model':
-        self.v_acc = self.mpc_model.v_mpc
-        self.a_acc = self.mpc_model.a_mpc
-
-    self.v_acc_future = min(possible_futures)
+      self.v_acc, self.a_acc = ((self.v_cruise, self.a_cruise),
+                                (self.mpc1.v_mpc, self.mpc1.a_mpc),
+                                (self.mpc2.v_mpc, self.mpc2.a_mpc),
+                                (self.mpc_model.v_mpc, self.mpc_model.a_mpc))[slowest]
+
+    self.v_acc_future = v_acc_future
 
   def update(self, sm, CP):
     """Gets called when new radarState is available"""
     cur_time = sec_since_boot()
-    v_ego = sm['carState'].vEgo
+    CS = sm['carState']
+    controls_state = sm['controlsState']
+    radar_state = sm['radarState']
+    v_ego = CS.vEgo
+    a_ego = CS.aEgo
     self.vego = v_ego
 
-    long_control_state = sm['controlsState'].longControlState
+    long_control_state = controls_state.longControlState
     if CP.sccBus == 2:
-      v_cruise_kph = sm['carState'].vSetDis
+      v_cruise_kph = CS.vSetDis
     else:
-      v_cruise_kph = sm['controlsState'].vCruise
-    force_slow_decel = sm['controlsState'].forceDecel
+      v_cruise_kph = controls_state.vCruise
+    force_slow_decel = controls_state.forceDecel
 
     v_cruise_kph = min(v_cruise_kph, V_CRUISE_MAX)
     v_cruise_setpoint = v_cruise_kph * CV.KPH_TO_MS
 
-    lead_1 = sm['radarState'].leadOne
-    lead_2 = sm['radarState'].leadTwo
+    lead_1 = radar_state.leadOne
+    lead_2 = radar_state.leadTwo
 
     enabled = (long_control_state == LongCtrlState.pid) or (long_control_state == LongCtrlState.stopping)
     following = lead_1.status and lead_1.dRel < 45.0 and lead_1.vLeadK > v_ego and lead_1.aLeadK > 0.0
@@ -186,16 +233,15 @@ class Planner():
     self.v_acc_start = self.v_acc_next
     self.a_acc_start = self.a_acc_next
 
-    if self.params.get_bool("OpkrMapEnable"):
+    if self.cached_bool("OpkrMapEnable", cur_time):
       self.target_speed_map_counter += 1
       if self.target_speed_map_counter >= (50+self.target_speed_map_counter1) and self.target_speed_map_counter_check == False:
         self.target_speed_map_counter_check = True
-        os.system("logcat -d -s opkrspdlimit,opkrspd2limit | grep opkrspd | tail -n 1 | awk \'{print $7}\' > /data/params/d/LimitSetSpeedCamera &")
-        os.system("logcat -d -s opkrspddist | grep opkrspd | tail -n 1 | awk \'{print $7}\' > /data/params/d/LimitSetSpeedCameraDist &")
         self.target_speed_map_counter3 += 1
-        if self.target_speed_map_counter3 > 2:
+        clear = self.target_speed_map_counter3 > 2
+        if clear:
           self.target_speed_map_counter3 = 0
-          os.system("logcat -c &")
+        self.map_speed_requests.put((True, clear))
       elif self.target_speed_map_counter >= (75+self.target_speed_map_counter1):
         self.target_speed_map_counter1 = 0
         self.target_speed_map_counter = 0
@@ -203,15 +249,18 @@ class Planner():
         mapspeed = self.params.get("LimitSetSpeedCamera", encoding="utf8")
         mapspeeddist = self.params.get("LimitSetSpeedCameraDist", encoding="utf8")
         if mapspeed is not None and mapspeeddist is not None:
-          mapspeed = int(float(mapspeed.rstrip('\n')))
-          mapspeeddist = int(float(mapspeeddist.rstrip('\n')))
+          try:
+            mapspeed = int(float(mapspeed))  # float() already ignores the trailing newline
+            mapspeeddist = int(float(mapspeeddist))
+          except (ValueError, OverflowError):
+            mapspeed = mapspeeddist = 0
           if mapspeed > 29:
             self.target_speed_map = mapspeed
             self.target_speed_map_dist = mapspeeddist
             if self.target_speed_map_dist > 1001:
               self.target_speed_map_block = True
             self.target_speed_map_counter1 = 80
-            os.system("logcat -c &")
+            self.map_speed_requests.put((False, True))
           else:
             self.target_speed_map = 0
             self.target_speed_map_dist = 0
@@ -234,29 +283,27 @@ class Planner():
           self.target_speed_map_sign = False
 
     # Calculate speed for normal cruise control
-    if enabled and not self.first_loop and not sm['carState'].brakePressed and not sm['carState'].gasPressed:
-      accel_limits = [float(x) for x in calc_cruise_accel_limits(v_ego, following)]
-      jerk_limits = [min(-0.1, accel_limits[0]), max(0.1, accel_limits[1])]  # TODO: make a separate lookup for jerk tuning
-      accel_limits_turns = limit_accel_in_turns(v_ego, sm['carState'].steeringAngleDeg, accel_limits, self.CP)
+    if enabled and not self.first_loop and not CS.brakePressed and not CS.gasPressed:
+      a_min, a_max, a_max_turns = calc_accel_limits(v_ego, CS.steeringAngleDeg, following, self.CP)
+      j_min, j_max = min(-0.1, a_min), max(0.1, a_max)  # TODO: make a separate lookup for jerk tuning
 
       if force_slow_decel and False: # awareness decel is disabled for now
         # if required so, force a smooth deceleration
-        accel_limits_turns[1] = min(accel_limits_turns[1], AWARENESS_DECEL)
-        accel_limits_turns[0] = min(accel_limits_turns[0], accel_limits_turns[1])
+        a_max_turns = min(a_max_turns, AWARENESS_DECEL)
+        a_min = min(a_min, a_max_turns)
 
       self.v_cruise, self.a_cruise = speed_smoother(self.v_acc_start, self.a_acc_start,
                                                     v_cruise_setpoint,
-                                                    accel_limits_turns[1], accel_limits_turns[0],
-                                                    jerk_limits[1], jerk_limits[0],
+                                                    a_max_turns, a_min,
+                                                    j_max, j_min,
                                                     LON_MPC_STEP)
 
       # cruise speed can't be negative even is user is distracted
       self.v_cruise = max(self.v_cruise, 0.)
     else:
       starting = long_control_state == LongCtrlState.starting
-      a_ego = min(sm['carState'].aEgo, 0.0)
       reset_speed = self.CP.minSpeedCan if starting else v_ego
-      reset_accel = self.CP.startAccel if starting else a_ego
+      reset_accel = self.CP.startAccel if starting else min(a_ego, 0.0)
       self.v_acc = reset_speed
       self.a_acc = reset_accel
       self.v_acc_start = reset_speed
@@ -268,28 +315,28 @@ class Planner():
     self.mpc2.set_cur_state(self.v_acc_start, self.a_acc_start)
     self.mpc_model.set_cur_state(self.v_acc_start, self.a_acc_start)
 
-    self.mpc1.update(sm['carState'], lead_1)
-    self.mpc2.update(sm['carState'], lead_2)
+    self.mpc1.update(CS, lead_1)
+    self.mpc2.update(CS, lead_2)
 
     distances, speeds, accelerations = self.model_mpc_helper.convert_data(sm)
-    self.mpc_model.update(sm['carState'].vEgo, sm['carState'].aEgo,
+    self.mpc_model.update(v_ego, a_ego,
                           distances,
                           speeds,
                           accelerations)
 
-    self.choose_solution(v_cruise_setpoint, enabled, self.params.get_bool("ModelLongEnabled"))
+    self.choose_solution(v_cruise_setpoint, enabled, self.cached_bool("ModelLongEnabled", cur_time))
 
     # determine fcw
     if self.mpc1.new_lead:
       self.fcw_checker.reset_lead(cur_time)
 
-    blinkers = sm['carState'].leftBlinker or sm['carState'].rightBlinker
+    blinkers = CS.leftBlinker or CS.rightBlinker
     self.fcw = self.fcw_checker.update(self.mpc1.mpc_solution, cur_time,
-                                       sm['controlsState'].active,
-                                       v_ego, sm['carState'].aEgo,
+                                       controls_state.active,
+                                       v_ego, a_ego,
                                        lead_1.dRel, lead_1.vLead, lead_1.aLeadK,
                                        lead_1.yRel, lead_1.vLat,
-                                       lead_1.fcw, blinkers) and not sm['carState'].brakePressed
+                                       lead_1.fcw, blinkers) and not CS.brakePressed
     if self.fcw:
       cloudlog.info("FCW triggered %s", self.fcw_checker.counters)
 
@@ -305,7 +352,8 @@ class Planner():
     self.mpc1.publish(pm)
     self.mpc2.publish(pm)
 
-    plan_send = messaging.new_message('longitudinalPlan')
+    plan_send = self.plan_send
+    plan_send.logMonoTime = int(sec_since_boot() * 1e9)
 
     plan_send.valid = sm.all_alive_and_valid(service_list=['carState', 'controlsState', 'radarState'])
 
@@ -327,31 +375,28 @@ class Planner():
     longitudinalPlan.processingDelay = (plan_send.logMonoTime / 1e9) - sm.rcv_time['radarState']
 
     # Send radarstate(dRel, vRel, yRel)
-    lead_1 = sm['radarState'].leadOne
-    lead_2 = sm['radarState'].leadTwo
-    longitudinalPlan.dRel1 = float(lead_1.dRel)
-    longitudinalPlan.yRel1 = float(lead_1.yRel)
-    longitudinalPlan.vRel1 = float(lead_1.vRel)
-    longitudinalPlan.dRel2 = float(lead_2.dRel)
-    longitudinalPlan.yRel2 = float(lead_2.yRel)
-    longitudinalPlan.vRel2 = float(lead_2.vRel)
-    longitudinalPlan.status2 = bool(lead_2.status)
-    cam_distance_calc = 0
-    cam_distance_calc = interp(self.vego*CV.MS_TO_KPH, [30,60,100,160], [3.75,5.5,6,7])
-    consider_speed = interp((self.vego*CV.MS_TO_KPH - self.target_speed_map), [10, 30], [1, 1.3])
-    if self.target_speed_map > 29 and self.target_speed_map_dist < cam_distance_calc*consider_speed*self.vego*CV.MS_TO_KPH:
-      longitudinalPlan.targetSpeedCamera = float(self.target_speed_map)
-      longitudinalPlan.targetSpeedCameraDist = float(self.target_speed_map_dist)
-      self.target_speed_map_sign = True
-    elif self.target_speed_map > 29 and self.target_speed_map_dist >= cam_distance_calc*consider_speed*self.vego*CV.MS_TO_KPH and self.target_speed_map_block:
-      longitudinalPlan.targetSpeedCamera = float(self.target_speed_map)
-      longitudinalPlan.targetSpeedCameraDist = float(self.target_speed_map_dist)
-      self.target_speed_map_sign = True
-    elif self.target_speed_map > 29 and self.target_speed_map_sign:
+    radar_state = sm['radarState']
+    lead_1 = radar_state.leadOne
+    lead_2 = radar_state.leadTwo
+    longitudinalPlan.dRel1 = lead_1.dRel
+    longitudinalPlan.yRel1 = lead_1.yRel
+    longitudinalPlan.vRel1 = lead_1.vRel
+    longitudinalPlan.dRel2 = lead_2.dRel
+    longitudinalPlan.yRel2 = lead_2.yRel
+    longitudinalPlan.vRel2 = lead_2.vRel
+    longitudinalPlan.status2 = lead_2.status
+    cam_threshold = calc_cam_distance_threshold(self.vego*CV.MS_TO_KPH, self.target_speed_map)
+    # show the camera once it is close enough (or far ones are blocked), then keep showing it
+    cam_in_range = self.target_speed_map_dist < cam_threshold or self.target_speed_map_block
+    if self.target_speed_map > 29 and (cam_in_range or self.target_speed_map_sign):
       longitudinalPlan.targetSpeedCamera = float(self.target_speed_map)
       longitudinalPlan.targetSpeedCameraDist = float(self.target_speed_map_dist)
+      if cam_in_range:
+        self.target_speed_map_sign = True
     else:
       longitudinalPlan.targetSpeedCamera = 0
       longitudinalPlan.targetSpeedCameraDist = 0
 
     pm.send('longitudinalPlan', plan_send)
+    # all fields are scalars that get overwritten in place, so the builder is safe to serialize again
+    plan_send.clear_write_flag()